@@ -2,76 +2,80 @@
 Banking Service CRUD Operations
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from models import BankAccount, BankAccountCreate
-from decimal import Decimal
+from sqlalchemy import select, insert, update, bindparam, Row
+from models import BankAccount, BankAccountCreate, to_cents, from_cents
 import logging
 
 logger = logging.getLogger(__name__)
 
-async def create_account(db: AsyncSession, user_id: str, account_data: BankAccountCreate) -> BankAccount:
+# Statements built once at import - per call only the parameters change
+_STMT_ACCOUNT_BY_USER = select(BankAccount).where(BankAccount.user_id == bindparam("user_id"))
+
+async def create_account(db: AsyncSession, user_id: str, account_data: BankAccountCreate) -> Row:
     """Create a new bank account!"""
-    account = BankAccount(
-        user_id=user_id,
-        balance=account_data.initial_balance
+    # Core insert - skips the ORM unit of work for this write-only path
+    result = await db.execute(
+        insert(BankAccount.__table__)
+        .values(user_id=user_id, balance=to_cents(account_data.initial_balance))
+        .returning(*BankAccount.__table__.c)
     )
-    
-    db.add(account)
+    account = result.one()
     await db.commit()
-    await db.refresh(account)
     
     logger.info(f"Created bank account for user {user_id} with balance {account_data.initial_balance}")
     return account
 
 async def get_account_by_user_id(db: AsyncSession, user_id: str) -> BankAccount:
     """Get bank account by user ID!"""
-    result = await db.execute(
-        select(BankAccount).where(BankAccount.user_id == user_id)
-    )
-    return result.scalar_one_or_none()
+    return await db.scalar(_STMT_ACCOUNT_BY_USER, {"user_id": user_id})
 
-async def check_balance(db: AsyncSession, user_id: str, amount: Decimal) -> tuple[bool, str]:
+async def check_balance(db: AsyncSession, user_id: str, amount: int) -> tuple[bool, str, int]:
     """Check if user has sufficient balance"""
     account = await get_account_by_user_id(db, user_id)
     
     if not account:
-        return False, "Account not found!"
+        return False, "Account not found!", 0
     
     if account.balance < amount:
-        return False, f"Insufficient balance. Available: {account.balance}, Required: {amount}"
+        return False, f"Insufficient balance. Available: {from_cents(account.balance)}, Required: {from_cents(amount)}", account.balance
     
-    return True, "Sufficient balance"
+    return True, "Sufficient balance", account.balance
 
-async def debit_account(db: AsyncSession, user_id: str, amount: Decimal) -> tuple[bool, str, Decimal]:
+async def debit_account(db: AsyncSession, user_id: str, amount: int) -> tuple[bool, str, int]:
     """Debit amount from user account"""
-    account = await get_account_by_user_id(db, user_id)
-    
-    if not account:
-        return False, "Account not found", Decimal("0")
-    
-    if account.balance < amount:
-        return False, f"Insufficient balance. Available: {account.balance}, Required: {amount}", account.balance
-    
-    # Deduct the amount
-    account.balance -= amount
+    # Guarded single-statement debit - no read-modify-write race
+    result = await db.execute(
+        update(BankAccount)
+        .where(BankAccount.user_id == user_id, BankAccount.balance >= amount)
+        .values(balance=BankAccount.balance - amount)
+        .returning(BankAccount.balance)
+    )
+    new_balance = result.scalar()
     await db.commit()
-    await db.refresh(account)
     
-    logger.info(f"Debited {amount} from user {user_id}. New balance: {account.balance}")
-    return True, "Transaction successful", account.balance
+    if new_balance is None:
+        # Nothing updated - find out why
+        account = await get_account_by_user_id(db, user_id)
+        if not account:
+            return False, "Account not found", 0
+        return False, f"Insufficient balance. Available: {from_cents(account.balance)}, Required: {from_cents(amount)}", account.balance
+    
+    logger.info(f"Debited {from_cents(amount)} from user {user_id}. New balance: {from_cents(new_balance)}")
+    return True, "Transaction successful", new_balance
 
-async def credit_account(db: AsyncSession, user_id: str, amount: Decimal) -> tuple[bool, str, Decimal]:
+async def credit_account(db: AsyncSession, user_id: str, amount: int) -> tuple[bool, str, int]:
     """Credit amount to user account"""
-    account = await get_account_by_user_id(db, user_id)
-    
-    if not account:
-        return False, "Account not found", Decimal("0")
-    
-    # Add the amount
-    account.balance += amount
+    result = await db.execute(
+        update(BankAccount)
+        .where(BankAccount.user_id == user_id)
+        .values(balance=BankAccount.balance + amount)
+        .returning(BankAccount.balance)
+    )
+    new_balance = result.scalar()
     await db.commit()
-    await db.refresh(account)
     
-    logger.info(f"Credited {amount} to user {user_id}. New balance: {account.balance}")
-    return True, "Transaction successful", account.balance
-
+    if new_balance is None:
+        return False, "Account not found", 0
+    
+    logger.info(f"Credited {from_cents(amount)} to user {user_id}. New balance: {from_cents(new_balance)}")
+    return True, "Transaction successful", new_balance
@@ -3,7 +3,9 @@ Banking Service Database Configuration
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
 from models import Base
+import asyncio
 import os
 import logging
 
@@ -20,7 +22,9 @@ engine = create_async_engine(
     future=True,
     pool_pre_ping=True,
     pool_size=10,
-    max_overflow=20
+    max_overflow=20,
+    # Keep parsed/planned statements on each pooled asyncpg connection
+    connect_args={"statement_cache_size": 2048, "prepared_statement_cache_size": 2048}
 )
 
 AsyncSessionLocal = sessionmaker(
@@ -36,10 +40,43 @@ async def init_db():
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await migrate_balance_to_cents(conn)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
+    
+    await warm_pool()
+
+async def migrate_balance_to_cents(conn):
+    """Convert a pre-existing NUMERIC(10,2) balance column to BIGINT cents - no-op once converted"""
+    # Serialize concurrently starting instances - held until this transaction commits, so a
+    # second instance only reads the column type after the first one's ALTER is visible
+    await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('bank_accounts.balance_to_cents'))"))
+    data_type = await conn.scalar(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() "
+        "AND table_name = 'bank_accounts' AND column_name = 'balance'"
+    ))
+    if data_type != "numeric":
+        return
+    
+    # create_all never alters existing tables - without this, stored dollars would be read as cents
+    await conn.execute(text(
+        "ALTER TABLE bank_accounts "
+        "ALTER COLUMN balance DROP DEFAULT, "
+        "ALTER COLUMN balance TYPE BIGINT USING round(balance * 100)::bigint"
+    ))
+    logger.info("Migrated bank_accounts.balance from NUMERIC to BIGINT cents")
+
+async def warm_pool():
+    """Open all pooled connections up front so the first requests skip connect latency"""
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    await asyncio.gather(*[_ping() for _ in range(engine.pool.size())])
+    logger.info(f"Database pool warmed with {engine.pool.size()} connections")
 
 async def get_db():
     """Dependency for getting database session"""
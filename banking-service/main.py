@@ -2,13 +2,13 @@
 Banking Service - Account management and balance operations
 """
 import asyncio
-from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi import FastAPI, HTTPException, Header, Depends, Query
 from typing import Optional
 import logging
 from decimal import Decimal
 
 from database import get_db, init_db, close_db
-from models import BankAccount, BankAccountCreate, BankAccountResponse, DebitRequest, DebitResponse
+from models import BankAccount, BankAccountCreate, BankAccountResponse, DebitRequest, DebitResponse, to_cents, from_cents
 from crud import (
     create_account,
     get_account_by_user_id,
@@ -91,7 +91,7 @@ async def create_bank_account(
         raise HTTPException(status_code=400, detail="Account already exists for this user")
     
     account = await create_account(db, user_id, account_data)
-    return BankAccountResponse.from_orm(account)
+    return BankAccountResponse(user_id=account.user_id, balance=from_cents(account.balance))
 
 @app.get("/accounts/my", response_model=BankAccountResponse)
 async def get_my_account(
@@ -104,7 +104,7 @@ async def get_my_account(
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     
-    return BankAccountResponse.from_orm(account)
+    return BankAccountResponse(user_id=account.user_id, balance=from_cents(account.balance))
 
 # ============================================================================
 # Internal Endpoints - For service-to-service communication
@@ -122,12 +122,12 @@ async def debit_user_account(
     success, message, new_balance = await debit_account(
         db,
         user_id=request.user_id,
-        amount=request.amount
+        amount=to_cents(request.amount)
     )
     
     return DebitResponse(
         success=success,
-        new_balance=new_balance if success else None,
+        new_balance=from_cents(new_balance) if success else None,
         message=message
     )
 
@@ -143,33 +143,36 @@ async def credit_user_account(
     success, message, new_balance = await credit_account(
         db,
         user_id=request.user_id,
-        amount=request.amount
+        amount=to_cents(request.amount)
     )
     
     return {
         "success": success,
-        "new_balance": float(new_balance) if success else None,
+        "new_balance": float(from_cents(new_balance)) if success else None,
         "message": message
     }
 
 @app.get("/internal/balance/{user_id}")
 async def check_user_balance(
     user_id: str,
-    amount: Decimal,
+    amount: Decimal = Query(..., gt=0),
     db = Depends(get_db)
 ):
     """
     Check if user has sufficient balance
     Called by Payment Service
     """
-    has_balance, message = await check_balance(db, user_id, amount)
+    try:
+        amount_cents = to_cents(amount)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     
-    account = await get_account_by_user_id(db, user_id)
+    has_balance, message, current_balance = await check_balance(db, user_id, amount_cents)
     
     return {
         "has_sufficient_balance": has_balance,
         "message": message,
-        "current_balance": float(account.balance) if account else 0
+        "current_balance": float(from_cents(current_balance))
     }
 
 if __name__ == "__main__":
@@ -1,35 +1,62 @@
 """
 Banking Service Database Models
 """
-from sqlalchemy import Column, String, Numeric
-from sqlalchemy.ext.declarative import declarative_base
-from decimal import Decimal
-from pydantic import BaseModel
-from typing import Optional
+from sqlalchemy import String, BigInteger
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from decimal import Decimal, InvalidOperation
+from pydantic import BaseModel, ConfigDict, AfterValidator, Field
+from typing import Optional, Annotated
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
 class BankAccount(Base):
     """Bank account model - simplified for demo"""
     __tablename__ = "bank_accounts"
     
-    user_id = Column(String, primary_key=True, index=True)
-    balance = Column(Numeric(precision=10, scale=2), default=1000.00, nullable=False)
+    user_id: Mapped[str] = mapped_column(String, primary_key=True, index=True)
+    balance: Mapped[int] = mapped_column(BigInteger, default=100000, nullable=False)  # cents
+
+# Money helpers - balances are stored as integer cents, the API speaks currency units
+MAX_CENTS = 2**63 - 1  # BIGINT upper bound
+
+def to_cents(value) -> int:
+    """Convert a currency amount such as "1000.00" to integer cents - sub-cent amounts are rejected"""
+    try:
+        cents = Decimal(str(value)).scaleb(2)
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"Invalid amount: {value!r}")
+    if not cents.is_finite() or cents != cents.to_integral_value():
+        raise ValueError(f"Invalid amount: {value!r} - at most 2 decimal places")
+    if abs(cents) > MAX_CENTS:
+        raise ValueError(f"Invalid amount: {value!r} - out of range")
+    return int(cents)
+
+def from_cents(cents: int) -> Decimal:
+    """Convert integer cents to a currency amount"""
+    return Decimal(cents).scaleb(-2)
+
+def _check_amount(value: Decimal) -> Decimal:
+    """Reject amounts that would not convert exactly to BIGINT cents"""
+    to_cents(value)
+    return value
+
+# Currency amount on the API - callers convert with to_cents explicitly
+Amount = Annotated[Decimal, AfterValidator(_check_amount)]
 
 # Pydantic models
 class BankAccountCreate(BaseModel):
-    initial_balance: Decimal = Decimal("1000.00")
+    initial_balance: Annotated[Amount, Field(ge=0)] = Decimal("1000.00")
 
 class BankAccountResponse(BaseModel):
     user_id: str
     balance: Decimal
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DebitRequest(BaseModel):
     user_id: str
-    amount: Decimal
+    amount: Annotated[Amount, Field(gt=0)]
 
 class DebitResponse(BaseModel):
     success: bool
@@ -0,0 +1,90 @@
+"""
+Unit Tests for Banking Service
+Tests money conversion and request validation
+"""
+import sys
+from pathlib import Path
+# Add parent folder (project root) to sys.path so local modules can be imported
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+proj_root_str = str(PROJECT_ROOT)
+if proj_root_str not in sys.path:
+    sys.path.insert(0, proj_root_str)
+
+import pytest
+from decimal import Decimal
+
+# Import models and functions to test
+from models import (
+    BankAccountCreate,
+    BankAccountResponse,
+    DebitRequest,
+    MAX_CENTS,
+    to_cents,
+    from_cents
+)
+
+
+# ============================================================================
+# MONEY CONVERSION TESTS
+# ============================================================================
+
+class TestMoney:
+    """Test currency <-> cents conversion"""
+    
+    @pytest.mark.parametrize("amount, cents", [
+        ("1000.00", 100000),
+        ("12.34", 1234),
+        ("1.000", 100),
+        (Decimal("0.01"), 1),
+        (25, 2500),
+        (10.25, 1025),
+    ])
+    def test_to_cents(self, amount, cents):
+        """Test whole-cent amounts convert exactly"""
+        assert to_cents(amount) == cents
+    
+    @pytest.mark.parametrize("amount", ["0.001", "12.345", "abc", "NaN", "Infinity", "1e30"])
+    def test_to_cents_invalid(self, amount):
+        """Test sub-cent, non-numeric and out-of-range amounts are rejected"""
+        with pytest.raises(ValueError):
+            to_cents(amount)
+    
+    def test_from_cents(self):
+        """Test cents convert back to a two-place currency amount"""
+        assert from_cents(1234) == Decimal("12.34")
+        assert str(from_cents(100000)) == "1000.00"
+    
+    def test_round_trip_at_bigint_limit(self):
+        """Test the largest storable balance survives a round trip"""
+        assert to_cents(from_cents(MAX_CENTS)) == MAX_CENTS
+
+
+# ============================================================================
+# MODEL TESTS
+# ============================================================================
+
+class TestModels:
+    """Test Pydantic models"""
+    
+    def test_bank_account_create_default(self):
+        """Test the default opening balance is in currency units"""
+        assert BankAccountCreate().initial_balance == Decimal("1000.00")
+    
+    def test_debit_request_amount_in_currency(self):
+        """Test debit amounts stay in currency units"""
+        request = DebitRequest(user_id="user-1", amount="12.34")
+        
+        assert request.amount == Decimal("12.34")
+        assert to_cents(request.amount) == 1234
+    
+    @pytest.mark.parametrize("amount", ["0.001", "0", "-5", "1e30"])
+    def test_debit_request_invalid_amount(self, amount):
+        """Test sub-cent, non-positive and out-of-range debits are rejected"""
+        with pytest.raises(Exception):  # Pydantic validation error
+            DebitRequest(user_id="user-1", amount=amount)
+    
+    def test_bank_account_response_keeps_currency(self):
+        """Test the response model does no unit conversion of its own"""
+        response = BankAccountResponse(user_id="user-1", balance=Decimal("12.34"))
+        
+        assert response.balance == Decimal("12.34")
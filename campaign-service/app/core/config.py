@@ -6,6 +6,7 @@ from pathlib import Path
 class Settings(BaseSettings):
     # Database
     database_url: str
+    pgbouncer: bool = False
     
     # App
     app_name: str = "Campaign Service API"
@@ -1,11 +1,14 @@
 import asyncio
+import os
+import random
+import asyncpg
 import structlog
 from sqlalchemy import text
+from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
-    AsyncSession,
+    async_sessionmaker,
 )
-from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
 from app.models.campaign import Base
@@ -14,39 +17,64 @@ settings = get_settings()
 logger = structlog.get_logger()
 
 # ✅ ASYNC ENGINE
+if settings.pgbouncer:
+    # PgBouncer owns pooling and can't share prepared statements across clients
+    engine_options = dict(
+        poolclass=NullPool,
+        connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+    )
+else:
+    # Bounded pool, no SELECT 1 per checkout - stale connections are recycled instead
+    engine_options = dict(
+        pool_size=max(2 * (os.cpu_count() or 1), 20),
+        max_overflow=0,
+        pool_pre_ping=False,
+        pool_recycle=1800,
+        connect_args={"statement_cache_size": 1024, "prepared_statement_cache_size": 256},
+    )
+
 engine = create_async_engine(
     settings.database_url,
-    pool_size=20,
-    max_overflow=30,
-    pool_pre_ping=True,
-    pool_recycle=300,
     echo=False,
+    **engine_options,
 )
 
 # ✅ ASYNC SESSION FACTORY
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
+AsyncSessionLocal = async_sessionmaker(
+    engine,
     expire_on_commit=False,
+    autoflush=False,
 )
 
 # ✅ WAIT FOR DB
-async def wait_for_db(max_retries=30, delay=2):
-    for attempt in range(max_retries):
+async def wait_for_db(max_wait=60, max_delay=8):
+    # Probe with a bare asyncpg connection so retries don't churn the engine pool
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    loop = asyncio.get_running_loop()
+    # Overall budget, probes included - a misconfigured database still fails after ~max_wait seconds
+    deadline = loop.time() + max_wait
+    attempt = 0
+    while True:
+        attempt += 1
         try:
-            async with engine.connect() as conn:
-                await conn.execute(text("SELECT 1"))
+            conn = await asyncpg.connect(dsn, timeout=1.0)
+            try:
+                await conn.execute("SELECT 1")
+            finally:
+                await conn.close()
             logger.info("Database connection established")
             return
         except Exception as e:
             logger.warning(
-                f"Database connection attempt {attempt + 1}/{max_retries} failed",
+                f"Database connection attempt {attempt} failed",
                 error=str(e),
             )
-            if attempt < max_retries - 1:
-                await asyncio.sleep(delay)
+            remaining = deadline - loop.time()
+            if remaining > 0:
+                # Jittered exponential backoff: ~0.1s, 0.2s, 0.4s ... capped at max_delay and the budget
+                await asyncio.sleep(min(remaining, min(max_delay, 0.1 * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)))
             else:
-                logger.error("Failed to connect to database after all retries")
+                logger.error(f"Failed to connect to database within {max_wait}s")
                 raise
 
 # ✅ INIT DB
@@ -58,6 +86,21 @@ async def init_db():
 
     logger.info("Database tables created successfully")
 
+    await warm_pool()
+
+# ✅ WARM POOL
+async def warm_pool():
+    # Open every pooled connection up front so the first requests skip connect + auth
+    if isinstance(engine.pool, NullPool):
+        return
+
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*[_ping() for _ in range(engine.pool.size())])
+    logger.info("Database pool warmed", connections=engine.pool.size())
+
 # ✅ FASTAPI DEPENDENCY
 async def get_db():
     async with AsyncSessionLocal() as session:
@@ -67,8 +110,6 @@ async def get_db():
             await session.rollback()
             logger.error("Database session error", error=str(e))
             raise
-        finally:
-            await session.close()
 
 # ✅ SHUTDOWN
 async def close_db():
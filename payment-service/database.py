@@ -3,6 +3,7 @@ Payment Service - Database Configuration
 """
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import text
 from sqlalchemy.pool import NullPool
 import os
 import logging
@@ -30,8 +31,25 @@ async def init_db():
     """Initialize database - create tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await apply_timestamp_defaults(conn)
     logger.info("Payment database initialized successfully")
 
+async def apply_timestamp_defaults(conn):
+    """Give tables created before the server-side defaults their now() defaults - no-op once applied"""
+    # create_all never alters existing tables, and INSERTs now leave created_at to the database
+    missing = (await conn.execute(text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'payments' "
+        "AND column_name IN ('created_at', 'updated_at') AND column_default IS NULL"
+    ))).scalars().all()
+    if not missing:
+        return
+    
+    await conn.execute(text(
+        "ALTER TABLE payments " + ", ".join(f"ALTER COLUMN {column} SET DEFAULT now()" for column in missing)
+    ))
+    logger.info(f"Applied now() defaults to payments: {', '.join(missing)}")
+
 async def get_db() -> AsyncSession:
     """Dependency to get database session"""
     async with AsyncSessionLocal() as session:
@@ -6,7 +6,7 @@ from typing import Optional
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from sqlalchemy import Column, String, Numeric, DateTime, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, Numeric, DateTime, Text, Enum as SQLEnum, func
 from sqlalchemy.dialects.postgresql import UUID
 from database import Base
 import uuid
@@ -56,8 +56,8 @@ class Payment(Base):
     refund_reason = Column(Text, nullable=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     completed_at = Column(DateTime, nullable=True)
     refunded_at = Column(DateTime, nullable=True)
 
@@ -2,22 +2,42 @@
 User Service - CRUD Operations
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List
+from sqlalchemy import select, update, delete, bindparam, func
+from typing import Optional, List, AsyncIterator
 from models import User, UserCreate, UserUpdate
-from utils import hash_password, verify_password
+import uuid
+from utils import hash_password_async, verify_password_async
+from middleware.tracing import get_tracer
+from contextlib import nullcontext
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Span attributes per operation - built once, the query set here is small and fixed
+_STATIC_ATTRS = {
+    op: {"db.system": "postgresql", "db.operation": op, "db.sql.table": "users"}
+    for op in ("SELECT", "INSERT", "UPDATE", "DELETE")
+}
+
+def _span(name: str, operation: str):
+    """One span per CRUD call, or a no-op when tracing is off"""
+    tracer = get_tracer(__name__)
+    if tracer is None:
+        return nullcontext()
+    return tracer.start_as_current_span(name, attributes=_STATIC_ATTRS[operation])
+
+# Statements built once at import - per call only the parameters change
+_STMT_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_STMT_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
 # ============================================================================
 # CREATE
 # ============================================================================
 
 async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
     """Create a new user"""
-    # Hash password
-    hashed_password = hash_password(user_data.password)
+    # Hash password off the event loop
+    hashed_password = await hash_password_async(user_data.password)
     
     # Create user object
     user = User(
@@ -27,9 +47,10 @@ async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
         role=user_data.role or "user"
     )
     
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    with _span("crud.create_user", "INSERT"):
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
     
     logger.info(f"Created user: {user.email}")
     return user
@@ -38,19 +59,15 @@ async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
 # READ
 # ============================================================================
 
-async def get_user_by_id(db: AsyncSession, user_id: str) -> Optional[User]:
+async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
     """Get user by ID!!"""
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    return result.scalar_one_or_none()
+    with _span("crud.get_user_by_id", "SELECT"):
+        return await db.scalar(_STMT_USER_BY_ID, {"user_id": user_id})
 
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Get user by email!"""
-    result = await db.execute(
-        select(User).where(User.email == email)
-    )
-    return result.scalar_one_or_none()
+    with _span("crud.get_user_by_email", "SELECT"):
+        return await db.scalar(_STMT_USER_BY_EMAIL, {"email": email})
 
 async def get_all_users(
     db: AsyncSession,
@@ -58,10 +75,25 @@ async def get_all_users(
     limit: int = 100
 ) -> List[User]:
     """Get all users with pagination"""
-    result = await db.execute(
-        select(User).offset(skip).limit(limit)
-    )
-    return result.scalars().all()
+    with _span("crud.get_all_users", "SELECT"):
+        result = await db.execute(
+            select(User).offset(skip).limit(limit)
+        )
+        return result.scalars().all()
+
+async def stream_users(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100
+) -> AsyncIterator[User]:
+    """Stream users with pagination using a server-side cursor"""
+    # Span covers opening the cursor only - a current span must not stay open across yields
+    with _span("crud.stream_users", "SELECT"):
+        result = await db.stream_scalars(
+            select(User).offset(skip).limit(limit).execution_options(yield_per=200)
+        )
+    async for user in result:
+        yield user
 
 # ============================================================================
 # UPDATE
@@ -69,26 +101,32 @@ async def get_all_users(
 
 async def update_user(
     db: AsyncSession,
-    user_id: str,
+    user_id: uuid.UUID,
     user_data: UserUpdate
 ) -> User:
     """Update user"""
-    user = await get_user_by_id(db, user_id)
-    if not user:
-        return None
-    
-    # Update fields
-    update_data = user_data.dict(exclude_unset=True)
+    update_data = user_data.model_dump(exclude_unset=True)
     
     # Handle password separately
     if "password" in update_data:
-        update_data["hashed_password"] = hash_password(update_data.pop("password"))
+        update_data["hashed_password"] = await hash_password_async(update_data.pop("password"))
+    
+    if not update_data:
+        return await get_user_by_id(db, user_id)
     
-    for field, value in update_data.items():
-        setattr(user, field, value)
+    with _span("crud.update_user", "UPDATE"):
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        user = result.scalar_one_or_none()
+        await db.commit()
     
-    await db.commit()
-    await db.refresh(user)
+    if not user:
+        return None
     
     logger.info(f"Updated user: {user.email}")
     return user
@@ -97,16 +135,19 @@ async def update_user(
 # DELETE
 # ============================================================================
 
-async def delete_user(db: AsyncSession, user_id: str) -> bool:
+async def delete_user(db: AsyncSession, user_id: uuid.UUID) -> bool:
     """Delete user"""
-    user = await get_user_by_id(db, user_id)
-    if not user:
-        return False
+    with _span("crud.delete_user", "DELETE"):
+        result = await db.execute(
+            delete(User).where(User.id == user_id).returning(User.email)
+        )
+        email = result.scalar_one_or_none()
+        await db.commit()
     
-    await db.delete(user)
-    await db.commit()
+    if email is None:
+        return False
     
-    logger.info(f"Deleted user: {user.email}")
+    logger.info(f"Deleted user: {email}")
     return True
 
 # ============================================================================
@@ -124,7 +165,21 @@ async def validate_user_credentials(
     if not user:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     
-    return user
\ No newline at end of file
+    return user
+
+async def update_last_login(db: AsyncSession, user_id: uuid.UUID) -> Optional[dict]:
+    """Stamp last login and return the user's public fields"""
+    with _span("crud.update_last_login", "UPDATE"):
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(last_login=func.now())
+            .returning(User.id, User.email, User.full_name, User.role)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        await db.commit()
+    return dict(row._mapping) if row else None
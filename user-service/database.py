@@ -3,6 +3,7 @@ User Service - Database Configuration
 """
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import text
 from sqlalchemy.pool import NullPool
 import os
 import logging
@@ -33,8 +34,25 @@ async def init_db():
     """Initialize database - create tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await apply_timestamp_defaults(conn)
     logger.info("Database initialized successfully")
 
+async def apply_timestamp_defaults(conn):
+    """Give tables created before the server-side defaults their now() defaults - no-op once applied"""
+    # create_all never alters existing tables, and INSERTs now leave created_at to the database
+    missing = (await conn.execute(text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'users' "
+        "AND column_name IN ('created_at', 'updated_at') AND column_default IS NULL"
+    ))).scalars().all()
+    if not missing:
+        return
+    
+    await conn.execute(text(
+        "ALTER TABLE users " + ", ".join(f"ALTER COLUMN {column} SET DEFAULT now()" for column in missing)
+    ))
+    logger.info(f"Applied now() defaults to users: {', '.join(missing)}")
+
 async def get_db() -> AsyncSession:
     """Dependency to get database session"""
     async with AsyncSessionLocal() as session:
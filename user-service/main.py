@@ -3,10 +3,11 @@ User Service - Handles all user-related business logic
 No JWT handling - that's done by the API Gateway
 """
 from fastapi import FastAPI, HTTPException, Header, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from typing import Optional, List
-from datetime import datetime
+from pydantic import TypeAdapter
 import logging
+import uuid
 
 from database import get_db, init_db
 from models import User, UserCreate, UserUpdate, UserResponse
@@ -14,10 +15,11 @@ from crud import (
     create_user,
     get_user_by_id,
     get_user_by_email,
-    get_all_users,
+    stream_users,
     update_user,
     delete_user,
-    validate_user_credentials
+    validate_user_credentials,
+    update_last_login
 )
 from utils import hash_password, verify_password
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -28,7 +30,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="User Service",
     description="User management microservice",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Initialize tracing after app creation
@@ -57,8 +60,8 @@ async def health_check():
 # HELPER: Extract user from gateway headers
 # ============================================================================
 
-def get_current_user_id(x_user_id: Optional[str] = Header(None)) -> Optional[str]:
-    """Extract user ID from gateway header"""
+def get_current_user_id(x_user_id: Optional[uuid.UUID] = Header(None)) -> Optional[uuid.UUID]:
+    """Extract user ID from gateway header - parsed once here, a malformed ID is a 422"""
     return x_user_id
 
 def get_current_user_role(x_user_role: Optional[str] = Header(None)) -> Optional[str]:
@@ -70,6 +73,20 @@ def require_admin(x_user_role: Optional[str] = Header(None)):
     if x_user_role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
 
+# ============================================================================
+# HELPER: Serialize users
+# ============================================================================
+
+# Built once at import - validation and JSON encoding both run in pydantic-core
+USER_RESPONSE_ADAPTER = TypeAdapter(UserResponse)
+
+def user_response(user: User) -> Response:
+    """Serialize a user straight to a JSON response, skipping FastAPI's jsonable_encoder pass"""
+    return Response(
+        content=USER_RESPONSE_ADAPTER.dump_json(USER_RESPONSE_ADAPTER.validate_python(user)),
+        media_type="application/json"
+    )
+
 # ============================================================================
 # AUTH ENDPOINTS - Called by Gateway
 # ============================================================================
@@ -117,16 +134,13 @@ async def validate_credentials(credentials: dict, db = Depends(get_db)):
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account disabled")
     
-    # Update last login
-    user.last_login = datetime.utcnow()
-    await db.commit()
+    # Update last login and read back the response fields in one statement
+    user_data = await update_last_login(db, user.id)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    return {
-        "id": user.id,
-        "email": user.email,
-        "full_name": user.full_name,
-        "role": user.role
-    }
+    # Hot login path - orjson encodes the row mapping (UUID included) directly
+    return ORJSONResponse(user_data)
 
 # ============================================================================
 # USER ENDPOINTS
@@ -134,7 +148,7 @@ async def validate_credentials(credentials: dict, db = Depends(get_db)):
 
 @app.get("/users/me")
 async def get_my_profile(
-    user_id: str = Depends(get_current_user_id),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db = Depends(get_db)
 ):
     """Get current user's profile"""
@@ -145,28 +159,27 @@ async def get_my_profile(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return UserResponse.from_orm(user)
+    return user_response(user)
 
 @app.put("/users/me")
 async def update_my_profile(
     user_update: UserUpdate,
-    user_id: str = Depends(get_current_user_id),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db = Depends(get_db)
 ):
     """Update current user's profile"""
     if not user_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    user = await get_user_by_id(db, user_id)
-    if not user:
+    updated_user = await update_user(db, user_id, user_update)
+    if not updated_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    updated_user = await update_user(db, user_id, user_update)
-    return UserResponse.from_orm(updated_user)
+    return user_response(updated_user)
 
 @app.delete("/users/me")
 async def delete_my_account(
-    user_id: str = Depends(get_current_user_id),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db = Depends(get_db)
 ):
     """Delete current user's account"""
@@ -180,40 +193,45 @@ async def delete_my_account(
 # ADMIN ENDPOINTS - User Management
 # ============================================================================
 
-@app.get("/users", dependencies=[Depends(require_admin)])
+@app.get("/users", dependencies=[Depends(require_admin)], response_model=List[UserResponse])
 async def list_users(
     skip: int = 0,
     limit: int = 100,
     db = Depends(get_db)
-) -> List[UserResponse]:
+) -> Response:
     """List all users (admin only)"""
-    users = await get_all_users(db, skip=skip, limit=limit)
-    return [UserResponse.from_orm(user) for user in users]
+    # Serialize each row as the cursor yields it - only the JSON bytes are kept, no ORM or
+    # response model list. The page is still buffered whole before the response is sent.
+    validate, dump = USER_RESPONSE_ADAPTER.validate_python, USER_RESPONSE_ADAPTER.dump_json
+    rows = [
+        dump(validate(user))
+        async for user in stream_users(db, skip=skip, limit=limit)
+    ]
+    return Response(content=b"[" + b",".join(rows) + b"]", media_type="application/json")
 
 @app.get("/users/{user_id}", dependencies=[Depends(require_admin)])
-async def get_user(user_id: str, db = Depends(get_db)):
+async def get_user(user_id: uuid.UUID, db = Depends(get_db)):
     """Get user by ID (admin only)"""
     user = await get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserResponse.from_orm(user)
+    return user_response(user)
 
 @app.put("/users/{user_id}", dependencies=[Depends(require_admin)])
 async def admin_update_user(
-    user_id: str,
+    user_id: uuid.UUID,
     user_update: UserUpdate,
     db = Depends(get_db)
 ):
     """Update any user (admin only)"""
-    user = await get_user_by_id(db, user_id)
-    if not user:
+    updated_user = await update_user(db, user_id, user_update)
+    if not updated_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    updated_user = await update_user(db, user_id, user_update)
-    return UserResponse.from_orm(updated_user)
+    return user_response(updated_user)
 
 @app.delete("/users/{user_id}", dependencies=[Depends(require_admin)])
-async def admin_delete_user(user_id: str, db = Depends(get_db)):
+async def admin_delete_user(user_id: uuid.UUID, db = Depends(get_db)):
     """Delete any user (admin only)"""
     await delete_user(db, user_id)
     return {"message": "User deleted successfully"}
@@ -226,7 +244,7 @@ async def admin_create_user(user_data: UserCreate, db = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     user = await create_user(db, user_data)
-    return UserResponse.from_orm(user)
+    return user_response(user)
 
 if __name__ == "__main__":
     import uvicorn
@@ -4,42 +4,47 @@ OpenTelemetry tracing configuration for User Service
 import logging
 import os
 
-# Only try to import tracing modules if they're available
-try:
-    from opentelemetry import trace
-    from opentelemetry.sdk.trace import TracerProvider
-    from opentelemetry.sdk.trace.export import BatchSpanProcessor
-    from opentelemetry.exporter.jaeger.thrift import JaegerExporter
-    from opentelemetry.sdk.resources import Resource, SERVICE_NAME
-    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
-    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
-    import structlog
-    TRACING_AVAILABLE = True
-except ImportError:
-    TRACING_AVAILABLE = False
-
 # Disable verbose logging from OpenTelemetry
 logging.getLogger("opentelemetry").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+# Set once init_tracing succeeds - OpenTelemetry is only imported from then on
+_tracing_active = False
+
+# Tracers handed out by get_tracer, keyed by instrumentation name - reset on every init
+_TRACER_CACHE = {}
+
 
 def init_tracing(app):
-    """Initialize OpenTelemetry tracing with Jaeger exporter"""
-    if not TRACING_AVAILABLE:
+    """Initialize OpenTelemetry tracing with OTLP/gRPC exporter"""
+    global _tracing_active
+    
+    # Any previously cached tracers belong to the old provider
+    _TRACER_CACHE.clear()
+    _tracing_active = False
+    
+    # Check the flag before importing anything so disabled deployments never load OpenTelemetry
+    if os.getenv("TRACING_ENABLED", "false").lower() != "true":
+        logger.info("Tracing disabled by configuration")
+        return False
+    
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from grpc import Compression
+        from opentelemetry.sdk.resources import Resource, SERVICE_NAME
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    except ImportError:
         logger.warning("OpenTelemetry modules not available. Tracing disabled.")
         return False
     
     try:
         # Get settings from environment
         service_name = os.getenv("SERVICE_NAME", "user-service")
-        jaeger_endpoint = os.getenv("JAEGER_ENDPOINT", "http://jaeger-demo:14268/api/traces")
-        tracing_enabled = os.getenv("TRACING_ENABLED", "false").lower() == "true"
-        
-        if not tracing_enabled:
-            logger.info("Tracing disabled by configuration")
-            return False
+        otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://jaeger:4317")
         
         # Create resource with service name
         resource = Resource(attributes={
@@ -51,48 +56,44 @@ def init_tracing(app):
         # Create tracer provider
         provider = TracerProvider(resource=resource)
         
-        # Configure Jaeger exporter
-        jaeger_exporter = JaegerExporter(
-            collector_endpoint=jaeger_endpoint,
+        # Configure OTLP exporter - protobuf over gRPC, Jaeger ingests it as a collector backend
+        otlp_exporter = OTLPSpanExporter(
+            endpoint=otlp_endpoint,
+            compression=Compression.Gzip,
         )
         
-        # Add span processor with batching
+        # Add span processor with batching - deeper queue, smaller and more frequent exports
         provider.add_span_processor(
             BatchSpanProcessor(
-                jaeger_exporter,
-                max_queue_size=2048,
-                max_export_batch_size=512,
-                schedule_delay_millis=5000
+                otlp_exporter,
+                max_queue_size=int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "4096")),
+                max_export_batch_size=int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "256")),
+                schedule_delay_millis=int(os.getenv("OTEL_BSP_SCHEDULE_DELAY", "1000")),
+                export_timeout_millis=int(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", "10000"))
             )
         )
         
         # Set global tracer provider
         trace.set_tracer_provider(provider)
         
-        # Instrument FastAPI - exclude health and metrics endpoints
+        # Instrument FastAPI - exclude health, metrics and docs endpoints.
+        # The list is compiled into a single regex once, here, not per request.
         FastAPIInstrumentor.instrument_app(
             app,
-            excluded_urls="/health,/metrics"
+            excluded_urls=os.getenv(
+                "OTEL_PYTHON_FASTAPI_EXCLUDED_URLS",
+                "/health,/metrics,/docs,/openapi.json,/favicon.ico,/redoc"
+            )
         )
         
-        # Instrument SQLAlchemy for database tracing
-        try:
-            SQLAlchemyInstrumentor().instrument()
-            logger.debug("SQLAlchemy instrumentation enabled")
-        except Exception as e:
-            logger.warning(f"Could not instrument SQLAlchemy: {e}")
-        
-        # Instrument HTTPX client for outbound HTTP calls
-        try:
-            HTTPXClientInstrumentor().instrument()
-            logger.debug("HTTPX instrumentation enabled")
-        except Exception as e:
-            logger.warning(f"Could not instrument HTTPX: {e}")
+        # No SQLAlchemy instrumentation - crud.py opens one span per call with static attributes
+        # No HTTPX instrumentation - this service makes no outbound HTTP calls
         
         logger.info(
-            f"OpenTelemetry tracing initialized successfully - Service: {service_name}, Endpoint: {jaeger_endpoint}"
+            f"OpenTelemetry tracing initialized successfully - Service: {service_name}, Endpoint: {otlp_endpoint}"
         )
         
+        _tracing_active = True
         return True
         
     except Exception as e:
@@ -103,7 +104,11 @@ def init_tracing(app):
 
 def get_tracer(name: str = __name__):
     """Get a tracer instance for manual span creation"""
-    if TRACING_AVAILABLE and trace.get_tracer_provider():
-        return trace.get_tracer(name)
-    else:
-        return None
\ No newline at end of file
+    if not _tracing_active:
+        return None
+    
+    tracer = _TRACER_CACHE.get(name)
+    if tracer is None:
+        from opentelemetry import trace
+        tracer = _TRACER_CACHE.setdefault(name, trace.get_tracer(name))
+    return tracer
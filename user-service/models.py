@@ -1,14 +1,43 @@
 """
 User Service - Data Models
 """
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+from typing import Annotated, Optional
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from database import Base
+import os
+import re
+import time
 import uuid
 
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUID (RFC 9562 version 7)"""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC variant
+    return uuid.UUID(int=value)
+
+# Plain ASCII email check - dot-separated atoms and hostname labels, each piece unambiguous,
+# so matching is linear with no catastrophic backtracking
+_ATEXT = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~\-]"  # RFC 5322 atext
+_EMAIL_RE = re.compile(
+    rf"{_ATEXT}+(?:\.{_ATEXT}+)*"
+    r"@(?:[A-Za-z0-9](?:[A-Za-z0-9\-]*[A-Za-z0-9])?\.)+"
+    r"(?:[A-Za-z]{2,24}|[Xx][Nn]--[A-Za-z0-9\-]*[A-Za-z0-9])",  # plain or punycode TLD
+    re.ASCII
+)
+
+def _check_email(value: str) -> str:
+    """Validate an email address and lower-case its domain, as EmailStr did"""
+    local, _, domain = value.rpartition("@")
+    if len(local) > 64 or len(domain) > 253 or not _EMAIL_RE.fullmatch(value):
+        raise ValueError("value is not a valid email address")
+    return f"{local}@{domain.lower()}"
+
+Email = Annotated[str, AfterValidator(_check_email)]
+
 # ============================================================================
 # SQLAlchemy Model (Database)
 # ============================================================================
@@ -17,7 +46,8 @@ class User(Base):
     """User database model"""
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # UUIDv7 keeps inserts appended to the right edge of the primary key btree
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     email = Column(String, unique=True, nullable=False, index=True)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=False)
@@ -25,8 +55,8 @@ class User(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     last_login = Column(DateTime, nullable=True)
     
     # Additional profile data (JSON for flexibility)
@@ -38,7 +68,9 @@ class User(Base):
 
 class UserBase(BaseModel):
     """Base user model"""
-    email: EmailStr
+    model_config = ConfigDict(frozen=True)
+    
+    email: Email
     full_name: str
     role: Optional[str] = "user"
 
@@ -48,7 +80,9 @@ class UserCreate(UserBase):
 
 class UserUpdate(BaseModel):
     """User update model - all fields optional"""
-    email: Optional[EmailStr] = None
+    model_config = ConfigDict(frozen=True)
+    
+    email: Optional[Email] = None
     full_name: Optional[str] = None
     password: Optional[str] = Field(None, min_length=8)
     role: Optional[str] = None
@@ -65,5 +99,4 @@ class UserResponse(BaseModel):
     updated_at: Optional[datetime]
     last_login: Optional[datetime]
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -12,33 +12,51 @@ if proj_root_str not in sys.path:
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
+import time
 import uuid
 from fastapi import HTTPException
-from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import models and functions to test
-from models import User, UserCreate, UserUpdate, UserResponse
+from models import User, UserCreate, UserUpdate, UserResponse, uuid7
 from crud import (
     create_user,
     get_user_by_id,
     get_user_by_email,
     get_all_users,
+    stream_users,
     update_user,
     delete_user,
-    validate_user_credentials
+    validate_user_credentials,
+    update_last_login
 )
-from utils import hash_password, verify_password
-from main import app
-
-# Test client
-client = TestClient(app)
+from utils import hash_password, verify_password, hash_password_async, verify_password_async
+from main import app, user_response
 
 
 # ============================================================================
 # FIXTURES
 # ============================================================================
 
+@dataclass(frozen=True, slots=True)
+class UserStub:
+    """Plain stand-in for a User row returned by patched CRUD calls"""
+    id: uuid.UUID
+    email: str
+    full_name: str
+    role: str
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    last_login: Optional[datetime] = None
+
+
 @pytest.fixture
 def sample_user_id():
     """Generate a sample UUID"""
@@ -72,16 +90,24 @@ def sample_user_create():
     )
 
 
+@pytest.fixture(scope="session")
+def client():
+    """In-process async client shared by all endpoint tests"""
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
 @pytest.fixture
 def mock_db_session():
-    """Mock database session"""
-    session = AsyncMock()
-    session.commit = AsyncMock()
-    session.refresh = AsyncMock()
-    session.delete = AsyncMock()
-    session.execute = AsyncMock()
-    session.add = MagicMock()
-    return session
+    """Mock database session - spec'd so async methods are AsyncMock and sync ones MagicMock"""
+    return AsyncMock(spec=AsyncSession)
+
+
+@pytest.fixture
+def mock_result(mock_db_session):
+    """Mock query result returned by the session's execute()"""
+    result = MagicMock(spec=Result)
+    mock_db_session.execute.return_value = result
+    return result
 
 
 # ============================================================================
@@ -114,6 +140,15 @@ class TestUtils:
         hashed = hash_password(password)
         
         assert verify_password(wrong_password, hashed) is False
+    
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_password_async(self):
+        """Test hashing and verification in worker threads"""
+        password = "mypassword123"
+        hashed = await hash_password_async(password)
+        
+        assert await verify_password_async(password, hashed) is True
+        assert await verify_password_async("wrongpassword", hashed) is False
 
 
 # ============================================================================
@@ -126,7 +161,7 @@ class TestCRUD:
     @pytest.mark.asyncio
     async def test_create_user(self, mock_db_session, sample_user_create):
         """Test user creation"""
-        with patch('crud.hash_password', return_value="hashed_password"):
+        with patch('crud.hash_password_async', return_value="hashed_password"):
             user = await create_user(mock_db_session, sample_user_create)
             
             # Verify user object was created
@@ -138,46 +173,38 @@ class TestCRUD:
     async def test_get_user_by_id(self, mock_db_session, sample_user, sample_user_id):
         """Test get user by ID"""
         # Mock database query result
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.scalar.return_value = sample_user
         
-        user = await get_user_by_id(mock_db_session, str(sample_user_id))
+        user = await get_user_by_id(mock_db_session, sample_user_id)
         
         assert user == sample_user
-        assert mock_db_session.execute.called
+        assert mock_db_session.scalar.called
     
     @pytest.mark.asyncio
     async def test_get_user_by_id_not_found(self, mock_db_session):
         """Test get user by ID when user doesn't exist"""
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.scalar.return_value = None
         
-        user = await get_user_by_id(mock_db_session, str(uuid.uuid4()))
+        user = await get_user_by_id(mock_db_session, uuid.uuid4())
         
         assert user is None
     
     @pytest.mark.asyncio
     async def test_get_user_by_email(self, mock_db_session, sample_user):
         """Test get user by email"""
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.scalar.return_value = sample_user
         
         user = await get_user_by_email(mock_db_session, "test@example.com")
         
         assert user == sample_user
-        assert mock_db_session.execute.called
+        assert mock_db_session.scalar.called
     
     @pytest.mark.asyncio
-    async def test_get_all_users(self, mock_db_session, sample_user):
+    async def test_get_all_users(self, mock_db_session, mock_result, sample_user):
         """Test get all users with pagination"""
-        mock_result = MagicMock()
         mock_scalars = MagicMock()
         mock_scalars.all.return_value = [sample_user]
         mock_result.scalars.return_value = mock_scalars
-        mock_db_session.execute.return_value = mock_result
         
         users = await get_all_users(mock_db_session, skip=0, limit=10)
         
@@ -185,60 +212,114 @@ class TestCRUD:
         assert users[0] == sample_user
     
     @pytest.mark.asyncio
-    async def test_update_user(self, mock_db_session, sample_user, sample_user_id):
+    async def test_stream_users(self, mock_db_session, sample_user):
+        """Test streaming users with pagination"""
+        mock_stream = MagicMock()
+        mock_stream.__aiter__.return_value = [sample_user]
+        mock_db_session.stream_scalars = AsyncMock(return_value=mock_stream)
+        
+        users = [user async for user in stream_users(mock_db_session, skip=0, limit=10)]
+        
+        assert users == [sample_user]
+        assert mock_db_session.stream_scalars.called
+    
+    @pytest.mark.asyncio
+    async def test_update_user(self, mock_db_session, mock_result, sample_user, sample_user_id):
         """Test user update"""
         update_data = UserUpdate(full_name="Updated Name")
+        mock_result.scalar_one_or_none.return_value = sample_user
+        
+        updated_user = await update_user(
+            mock_db_session,
+            sample_user_id,
+            update_data
+        )
         
-        with patch('crud.get_user_by_id', return_value=sample_user):
-            updated_user = await update_user(
+        assert mock_db_session.commit.called
+        assert not mock_db_session.refresh.called
+        assert updated_user is sample_user
+        # Only the fields that were set reach the UPDATE
+        stmt = mock_db_session.execute.call_args[0][0]
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert params["full_name"] == "Updated Name"
+        assert "email" not in params
+    
+    @pytest.mark.asyncio
+    async def test_update_user_with_password(self, mock_db_session, mock_result, sample_user, sample_user_id):
+        """Test user update with password change"""
+        update_data = UserUpdate(password="newpassword123")
+        mock_result.scalar_one_or_none.return_value = sample_user
+        
+        with patch('crud.hash_password_async', return_value="new_hashed_password") as mock_hash:
+            await update_user(
                 mock_db_session,
-                str(sample_user_id),
+                sample_user_id,
                 update_data
             )
             
-            assert mock_db_session.commit.called
-            assert mock_db_session.refresh.called
-            assert updated_user.full_name == "Updated Name"
+            mock_hash.assert_called_once_with("newpassword123")
+            stmt = mock_db_session.execute.call_args[0][0]
+            params = stmt.compile(dialect=postgresql.dialect()).params
+            assert params["hashed_password"] == "new_hashed_password"
+            assert "password" not in params
     
     @pytest.mark.asyncio
-    async def test_update_user_with_password(self, mock_db_session, sample_user, sample_user_id):
-        """Test user update with password change"""
-        update_data = UserUpdate(password="newpassword123")
+    async def test_update_user_not_found(self, mock_db_session, mock_result):
+        """Test update user when user doesn't exist"""
+        mock_result.scalar_one_or_none.return_value = None
         
-        with patch('crud.get_user_by_id', return_value=sample_user):
-            with patch('crud.hash_password', return_value="new_hashed_password") as mock_hash:
-                updated_user = await update_user(
-                    mock_db_session,
-                    str(sample_user_id),
-                    update_data
-                )
-                
-                mock_hash.assert_called_once_with("newpassword123")
-                assert updated_user.hashed_password == "new_hashed_password"
+        updated_user = await update_user(
+            mock_db_session,
+            uuid.uuid4(),
+            UserUpdate(full_name="Updated Name")
+        )
+        
+        assert updated_user is None
     
     @pytest.mark.asyncio
-    async def test_delete_user(self, mock_db_session, sample_user, sample_user_id):
+    async def test_delete_user(self, mock_db_session, mock_result, sample_user, sample_user_id):
         """Test user deletion"""
-        with patch('crud.get_user_by_id', return_value=sample_user):
-            result = await delete_user(mock_db_session, str(sample_user_id))
-            
-            assert result is True
-            assert mock_db_session.delete.called
-            assert mock_db_session.commit.called
+        mock_result.scalar_one_or_none.return_value = sample_user.email
+        
+        result = await delete_user(mock_db_session, sample_user_id)
+        
+        assert result is True
+        assert mock_db_session.execute.called
+        assert mock_db_session.commit.called
+        assert not mock_db_session.delete.called
     
     @pytest.mark.asyncio
-    async def test_delete_user_not_found(self, mock_db_session):
+    async def test_delete_user_not_found(self, mock_db_session, mock_result):
         """Test delete user when user doesn't exist"""
-        with patch('crud.get_user_by_id', return_value=None):
-            result = await delete_user(mock_db_session, str(uuid.uuid4()))
-            
-            assert result is False
+        mock_result.scalar_one_or_none.return_value = None
+        
+        result = await delete_user(mock_db_session, uuid.uuid4())
+        
+        assert result is False
+    
+    @pytest.mark.asyncio
+    async def test_update_last_login(self, mock_db_session, mock_result, sample_user):
+        """Test last login update returns the user's public fields"""
+        mock_row = MagicMock()
+        mock_row._mapping = {
+            "id": sample_user.id,
+            "email": sample_user.email,
+            "full_name": sample_user.full_name,
+            "role": sample_user.role
+        }
+        mock_result.one_or_none.return_value = mock_row
+        
+        user_data = await update_last_login(mock_db_session, sample_user.id)
+        
+        assert user_data["email"] == sample_user.email
+        assert mock_db_session.execute.called
+        assert mock_db_session.commit.called
     
     @pytest.mark.asyncio
     async def test_validate_user_credentials_success(self, mock_db_session, sample_user):
         """Test credential validation with correct credentials"""
         with patch('crud.get_user_by_email', return_value=sample_user):
-            with patch('crud.verify_password', return_value=True):
+            with patch('crud.verify_password_async', return_value=True):
                 user = await validate_user_credentials(
                     mock_db_session,
                     "test@example.com",
@@ -251,7 +332,7 @@ class TestCRUD:
     async def test_validate_user_credentials_wrong_password(self, mock_db_session, sample_user):
         """Test credential validation with wrong password"""
         with patch('crud.get_user_by_email', return_value=sample_user):
-            with patch('crud.verify_password', return_value=False):
+            with patch('crud.verify_password_async', return_value=False):
                 user = await validate_user_credentials(
                     mock_db_session,
                     "test@example.com",
@@ -280,9 +361,10 @@ class TestCRUD:
 class TestEndpoints:
     """Test API endpoints"""
     
-    def test_health_check(self):
+    @pytest.mark.asyncio
+    async def test_health_check(self, client):
         """Test health check endpoint"""
-        response = client.get("/health")
+        response = await client.get("/health")
         
         assert response.status_code == 200
         assert response.json() == {
@@ -290,24 +372,26 @@ class TestEndpoints:
             "service": "user-service"
         }
     
+    @pytest.mark.asyncio
     @patch('main.get_db')
     @patch('main.get_user_by_email')
     @patch('main.create_user')
-    def test_register_success(self, mock_create_user, mock_get_by_email, mock_get_db):
+    async def test_register_success(self, mock_create_user, mock_get_by_email, mock_get_db, client):
         """Test user registration"""
         # Mock no existing user
         mock_get_by_email.return_value = None
         
         # Mock created user
-        new_user = MagicMock()
-        new_user.id = uuid.uuid4()
-        new_user.email = "newuser@example.com"
-        new_user.full_name = "New User"
-        new_user.role = "user"
-        new_user.created_at = datetime.utcnow()
-        mock_create_user.return_value = new_user
-        
-        response = client.post(
+        mock_create_user.return_value = UserStub(
+            id=uuid.uuid4(),
+            email="newuser@example.com",
+            full_name="New User",
+            role="user",
+            is_active=True,
+            created_at=datetime.utcnow()
+        )
+        
+        response = await client.post(
             "/api/v1/auth/register",
             json={
                 "email": "newuser@example.com",
@@ -320,15 +404,22 @@ class TestEndpoints:
         assert response.status_code == 201
         assert "email" in response.json()
     
+    @pytest.mark.asyncio
     @patch('main.get_db')
     @patch('main.get_user_by_email')
-    def test_register_duplicate_email(self, mock_get_by_email, mock_get_db):
+    async def test_register_duplicate_email(self, mock_get_by_email, mock_get_db, client):
         """Test registration with existing email"""
         # Mock existing user
-        existing_user = MagicMock()
-        mock_get_by_email.return_value = existing_user
+        mock_get_by_email.return_value = UserStub(
+            id=uuid.uuid4(),
+            email="existing@example.com",
+            full_name="Existing User",
+            role="user",
+            is_active=True,
+            created_at=datetime.utcnow()
+        )
         
-        response = client.post(
+        response = await client.post(
             "/api/v1/auth/register",
             json={
                 "email": "existing@example.com",
@@ -340,20 +431,30 @@ class TestEndpoints:
         assert response.status_code == 400
         assert "already registered" in response.json()["detail"]
     
+    @pytest.mark.asyncio
     @patch('main.get_db')
+    @patch('main.update_last_login')
     @patch('main.validate_user_credentials')
-    def test_validate_credentials_success(self, mock_validate, mock_get_db):
+    async def test_validate_credentials_success(self, mock_validate, mock_update_last_login, mock_get_db, client):
         """Test credential validation endpoint"""
         # Mock valid user
-        valid_user = MagicMock()
-        valid_user.id = uuid.uuid4()
-        valid_user.email = "user@example.com"
-        valid_user.full_name = "Test User"
-        valid_user.role = "user"
-        valid_user.is_active = True
+        valid_user = UserStub(
+            id=uuid.uuid4(),
+            email="user@example.com",
+            full_name="Test User",
+            role="user",
+            is_active=True,
+            created_at=datetime.utcnow()
+        )
         mock_validate.return_value = valid_user
+        mock_update_last_login.return_value = {
+            "id": str(valid_user.id),
+            "email": valid_user.email,
+            "full_name": valid_user.full_name,
+            "role": valid_user.role
+        }
         
-        response = client.post(
+        response = await client.post(
             "/api/v1/auth/validate-credentials",
             json={
                 "email": "user@example.com",
@@ -364,13 +465,14 @@ class TestEndpoints:
         assert response.status_code == 200
         assert "email" in response.json()
     
+    @pytest.mark.asyncio
     @patch('main.get_db')
     @patch('main.validate_user_credentials')
-    def test_validate_credentials_invalid(self, mock_validate, mock_get_db):
+    async def test_validate_credentials_invalid(self, mock_validate, mock_get_db, client):
         """Test credential validation with invalid credentials"""
         mock_validate.return_value = None
         
-        response = client.post(
+        response = await client.post(
             "/api/v1/auth/validate-credentials",
             json={
                 "email": "user@example.com",
@@ -381,52 +483,92 @@ class TestEndpoints:
         assert response.status_code == 401
         assert "Invalid credentials" in response.json()["detail"]
     
+    @pytest.mark.asyncio
     @patch('main.get_db')
     @patch('main.get_user_by_id')
-    def test_get_my_profile(self, mock_get_by_id, mock_get_db):
+    async def test_get_my_profile(self, mock_get_by_id, mock_get_db, client):
         """Test get current user profile"""
         # Mock user
-        user = MagicMock()
-        user.id = uuid.uuid4()
-        user.email = "user@example.com"
-        user.full_name = "Test User"
-        user.role = "user"
-        user.is_active = True
-        user.created_at = datetime.utcnow()
-        user.updated_at = None
-        user.last_login = None
+        user = UserStub(
+            id=uuid.uuid4(),
+            email="user@example.com",
+            full_name="Test User",
+            role="user",
+            is_active=True,
+            created_at=datetime.utcnow()
+        )
         mock_get_by_id.return_value = user
         
-        response = client.get(
+        response = await client.get(
             "/users/me",
             headers={"x-user-id": str(user.id)}
         )
         
         assert response.status_code == 200
+        # The header arrives at CRUD already parsed into a UUID
+        assert mock_get_by_id.call_args.args[1] == user.id
     
-    def test_get_my_profile_unauthorized(self):
+    @pytest.mark.asyncio
+    async def test_get_my_profile_unauthorized(self, client):
         """Test get profile without authentication"""
-        response = client.get("/users/me")
+        response = await client.get("/users/me")
         
         assert response.status_code == 401
     
+    @pytest.mark.asyncio
     @patch('main.get_db')
-    @patch('main.get_all_users')
-    def test_list_users_admin(self, mock_get_all, mock_get_db):
+    @patch('main.stream_users')
+    async def test_list_users_admin(self, mock_stream_users, mock_get_db, client):
         """Test list users as admin"""
-        # Mock users list
-        mock_get_all.return_value = []
+        # Mock empty users stream
+        async def no_users(*args, **kwargs):
+            return
+            yield
+        mock_stream_users.side_effect = no_users
+        
+        response = await client.get(
+            "/users",
+            headers={"x-user-role": "admin"}
+        )
         
-        response = client.get(
+        assert response.status_code == 200
+        assert response.json() == []
+    
+    @pytest.mark.asyncio
+    @patch('main.get_db')
+    @patch('main.stream_users')
+    async def test_list_users_admin_json_array(self, mock_stream_users, mock_get_db, client):
+        """Test streamed users are framed into one JSON array"""
+        users = [
+            UserStub(
+                id=uuid.uuid4(),
+                email=f"user{i}@example.com",
+                full_name=f"User {i}",
+                role="user",
+                is_active=True,
+                created_at=datetime.utcnow()
+            )
+            for i in range(2)
+        ]
+        async def two_users(*args, **kwargs):
+            for user in users:
+                yield user
+        mock_stream_users.side_effect = two_users
+        
+        response = await client.get(
             "/users",
             headers={"x-user-role": "admin"}
         )
         
         assert response.status_code == 200
+        body = response.json()
+        assert [user["id"] for user in body] == [str(user.id) for user in users]
+        assert [user["email"] for user in body] == [user.email for user in users]
     
-    def test_list_users_non_admin(self):
+    @pytest.mark.asyncio
+    async def test_list_users_non_admin(self, client):
         """Test list users without admin role"""
-        response = client.get(
+        response = await client.get(
             "/users",
             headers={"x-user-role": "user"}
         )
@@ -463,6 +605,36 @@ class TestModels:
                 full_name="Test User"
             )
 
+    def test_user_create_normalizes_email_domain(self):
+        """Test the email domain is lower-cased so one mailbox maps to one account"""
+        user_data = UserCreate(
+            email="A.User@Example.COM",
+            password="password123",
+            full_name="Test User"
+        )
+        
+        assert user_data.email == "A.User@example.com"
+    
+    @pytest.mark.parametrize("email", [
+        "o'brien@example.com",
+        "a!#$%&*/=?^`{|}~b@example.com",
+        "user@example.xn--p1ai",
+    ])
+    def test_user_create_accepts_rfc_emails(self, email):
+        """Test full RFC 5322 atext local parts and punycode TLDs are accepted"""
+        user_data = UserCreate(
+            email=email,
+            password="password123",
+            full_name="Test User"
+        )
+        
+        assert user_data.email == email
+    
+    def test_user_update_invalid_email(self):
+        """Test UserUpdate rejects a malformed email too"""
+        with pytest.raises(Exception):  # Pydantic validation error
+            UserUpdate(email="user@localhost")
+
     def test_user_create_short_password(self):
         """Test UserCreate with short password"""
         with pytest.raises(Exception):  # Pydantic validation error
@@ -483,9 +655,26 @@ class TestModels:
     
     def test_user_response_from_orm(self, sample_user):
         """Test UserResponse from ORM model"""
-        response = UserResponse.from_orm(sample_user)
+        response = UserResponse.model_validate(sample_user)
         
         assert response.email == sample_user.email
         assert response.full_name == sample_user.full_name
         assert response.role == sample_user.role
         assert response.is_active == sample_user.is_active
+    
+    def test_user_response_json(self, sample_user):
+        """Test users serialize straight to a JSON response"""
+        response = user_response(sample_user)
+        
+        assert response.media_type == "application/json"
+        assert UserResponse.model_validate_json(response.body).id == sample_user.id
+    
+    def test_uuid7_is_time_ordered(self):
+        """Test generated user IDs are version 7 and sort by creation time"""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        
+        assert first.version == 7
+        assert second.version == 7
+        assert first < second
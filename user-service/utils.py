@@ -1,19 +1,44 @@
 """
 User Service - Utility Functions
 """
-from passlib.context import CryptContext
-from pwdlib import PasswordHash
+import os
+import functools
+import anyio.to_thread
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-passlib_context = PasswordHash.recommended()
+@functools.cache
+def _password_hasher() -> PasswordHasher:
+    """Password hasher - argon2id, same scheme as the existing pwdlib hashes so they keep verifying.
+    Built on first use rather than at import."""
+    return PasswordHasher(
+        time_cost=int(os.getenv("ARGON2_TIME_COST", "2")),
+        memory_cost=int(os.getenv("ARGON2_MEMORY_COST", str(64 * 1024))),
+        parallelism=int(os.getenv("ARGON2_PARALLELISM", "1")),
+    )
 
 def hash_password(password: str) -> str:
     """Hash a password"""
-    # return pwd_context.hash(password)
-    return passlib_context.hash(password)
+    return _password_hasher().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    # return pwd_context.verify(plain_password, hashed_password)
-    return passlib_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    try:
+        return _password_hasher().verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+@functools.cache
+def _hash_limiter() -> anyio.CapacityLimiter:
+    """Bound concurrent hashes to the CPU count (built lazily inside the event loop)"""
+    return anyio.CapacityLimiter(os.cpu_count() or 1)
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread"""
+    return await anyio.to_thread.run_sync(hash_password, password, limiter=_hash_limiter())
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash in a worker thread"""
+    return await anyio.to_thread.run_sync(
+        verify_password, plain_password, hashed_password, limiter=_hash_limiter()
+    )